@@ -3,17 +3,27 @@ from urllib.parse import urljoin
 from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
 from langchain_ollama import ChatOllama
 from langchain_core.messages import HumanMessage
+import snapshot
+
+SNAPSHOT_SCOPE = "detailed"
+PAGE_TTL = 60 * 60  # re-crawl stored pages after an hour to keep data fresh
 
 class DetailedSearchAgent:
     def __init__(self, model_name="gemma3:4b"):
-        self.llm = ChatOllama(model=model_name, temperature=0)
+        self.llm = ChatOllama(model=model_name, temperature=0, keep_alive=snapshot.KEEP_ALIVE)
+        self.model_name = model_name
         self.available_links = [] 
         self.base_url = ""
         self.current_context = "" 
         self.last_targets = []
+        self.pages = {}  # url -> {"text", "fetched"}, reused across restarts
+        self.last_sources = []
 
-    async def map_site(self, url):
+    async def map_site(self, url, remap=False):
         self.base_url = url
+        if snapshot.restore_site(self, SNAPSHOT_SCOPE, PAGE_TTL, remap):
+            return
+
         print(f"\n🔍 Mapping site structure: {url}")
         async with AsyncWebCrawler() as crawler:
             result = await crawler.arun(url=url)
@@ -22,6 +32,8 @@ class DetailedSearchAgent:
             self.available_links = list(set([l for l in self.available_links if l]))
             print(f"📍 Map Complete: {len(self.available_links)} potential pages found.")
 
+        snapshot.save_map(self, SNAPSHOT_SCOPE, result.success)
+
     async def decide_and_crawl(self, question):
         print(f"\n🎯 Planning targeted crawl for: '{question}'")
         
@@ -41,8 +53,12 @@ class DetailedSearchAgent:
         if not self.last_targets:
             self.last_targets = [self.base_url]
 
-        print(f"🕷️ Fetching: {self.last_targets}")
-        self.current_context = "" 
+        await snapshot.gather_context(self, SNAPSHOT_SCOPE, PAGE_TTL, self.last_targets, self._fetch)
+        print(f"✅ Context ready.")
+
+    async def _fetch(self, urls):
+        print(f"🕷️ Fetching: {urls}")
+        fetched = {}
         
         config = CrawlerRunConfig(
             cache_mode=CacheMode.BYPASS, 
@@ -53,15 +69,15 @@ class DetailedSearchAgent:
         )
         
         async with AsyncWebCrawler() as crawler:
-            results = await crawler.arun_many(urls=self.last_targets, config=config)
+            results = await crawler.arun_many(urls=urls, config=config)
             async for r in results:
                 if r.success: 
                     # 5000 chars per page provides more detail for the "elaborate" response
                     content = r.markdown[:8000] 
-                    self.current_context += f"\n--- SOURCE: {r.url} ---\n{content}\n"
+                    fetched[r.url] = content
                     print(f"✔ Downloaded: {r.url}")
         
-        print(f"✅ Context ready.")
+        return fetched
 
     def chat_with_data(self, question):
         print("\n🤖 RESPONSE:")
@@ -93,16 +109,20 @@ class DetailedSearchAgent:
 
 async def main():
     agent = DetailedSearchAgent(model_name="gemma3:4b") 
+    snapshot.warm_up(agent.model_name)
     
     while True:
         print("\n" + "═"*40)
         print("1. Set Base URL (Map Site)")
-        print("2. Exit")
+        print("2. Re-map Base URL (Ignore Saved Map)")
+        print("3. Exit")
         choice = input("Select: ")
 
-        if choice == "1":
+        if choice in ("1", "2"):
             url = input("Enter Documentation URL: ").strip()
-            await agent.map_site(url)
+            await agent.map_site(url, remap=choice == "2")
+            while agent.current_context and input("\nFollow-up on last context? (y/n): ").lower() == "y":
+                agent.chat_with_data(input("\n💬 FOLLOW-UP: "))
             
             while True:
                 q = input("\n💬 QUERY: ")
@@ -119,7 +139,7 @@ async def main():
                         break
                 if sub == 'c':
                     break
-        elif choice == "2":
+        elif choice == "3":
             break
 
 if __name__ == "__main__":
@@ -3,6 +3,7 @@ from urllib.parse import urljoin
 from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
 from langchain_ollama import ChatOllama
 from langchain_core.messages import HumanMessage
+import snapshot
 
 
 KEYWORDS = [
@@ -12,20 +13,29 @@ KEYWORDS = [
 
 BAD_PAGES = ["further_reading", "glossary", "index"]
 
+SNAPSHOT_SCOPE = "fast"
+PAGE_TTL = 24 * 60 * 60  # stored pages are re-crawled once a day
+
 
 class DetailedSearchAgent:
     def __init__(self, model_name="gemma3:4b"):
-        self.llm = ChatOllama(model=model_name, temperature=0)
+        self.llm = ChatOllama(model=model_name, temperature=0, keep_alive=snapshot.KEEP_ALIVE)
+        self.model_name = model_name
         self.available_links = []
         self.base_url = ""
         self.current_context = ""
         self.last_targets = []
+        self.pages = {}  # url -> {"text", "fetched"}, reused across restarts
+        self.last_sources = []
 
     # --------------------------------------------------
     # MAP SITE (FAST, ONCE)
     # --------------------------------------------------
-    async def map_site(self, url):
+    async def map_site(self, url, remap=False):
         self.base_url = url
+        if snapshot.restore_site(self, SNAPSHOT_SCOPE, PAGE_TTL, remap):
+            return
+
         print(f"\n🔍 Mapping site structure: {url}")
 
         async with AsyncWebCrawler() as crawler:
@@ -42,6 +52,8 @@ class DetailedSearchAgent:
 
         print(f"📍 Map Complete: {len(self.available_links)} pages found.")
 
+        snapshot.save_map(self, SNAPSHOT_SCOPE, result.success)
+
     # --------------------------------------------------
     # FAST ROUTING (NO LLM)
     # --------------------------------------------------
@@ -73,8 +85,12 @@ class DetailedSearchAgent:
         if not self.last_targets:
             self.last_targets = [self.base_url]
 
-        print(f"🕷️ Fetching: {self.last_targets}")
-        self.current_context = ""
+        await snapshot.gather_context(self, SNAPSHOT_SCOPE, PAGE_TTL, self.last_targets, self._fetch)
+        print("✅ Context ready.")
+
+    async def _fetch(self, urls):
+        print(f"🕷️ Fetching: {urls}")
+        fetched = {}
 
         config = CrawlerRunConfig(
             cache_mode=CacheMode.ENABLED,
@@ -87,20 +103,17 @@ class DetailedSearchAgent:
 
         async with AsyncWebCrawler() as crawler:
             results = await crawler.arun_many(
-                urls=self.last_targets,
+                urls=urls,
                 config=config
             )
 
             # IMPORTANT: arun_many returns LIST
             for r in results:
                 if r.success:
-                    self.current_context += (
-                        f"\n--- SOURCE: {r.url} ---\n"
-                        f"{r.markdown[:3500]}\n"
-                    )
+                    fetched[r.url] = r.markdown[:3500]
                     print(f"✔ Downloaded: {r.url}")
 
-        print("✅ Context ready.")
+        return fetched
 
     # --------------------------------------------------
     # CHAT (MINIMAL BY DEFAULT)
@@ -140,16 +153,20 @@ RULES:
     # --------------------------------------------------
 async def main():
     agent = DetailedSearchAgent()
+    snapshot.warm_up(agent.model_name)
 
     while True:
         print("\n" + "═" * 40)
         print("1. Set Base URL (Map Site)")
-        print("2. Exit")
+        print("2. Re-map Base URL (Ignore Saved Map)")
+        print("3. Exit")
         choice = input("Select: ").strip()
 
-        if choice == "1":
+        if choice in ("1", "2"):
             url = input("Enter Documentation URL: ").strip()
-            await agent.map_site(url)
+            await agent.map_site(url, remap=choice == "2")
+            while agent.current_context and input("\nFollow-up on last context? (y/n): ").lower() == "y":
+                agent.chat_with_data(input("\n💬 FOLLOW-UP: "))
 
             while True:
                 q = input("\n💬 QUERY: ").strip()
@@ -172,7 +189,7 @@ async def main():
                 if sub == "c":
                     break
 
-        elif choice == "2":
+        elif choice == "3":
             break
 
 
@@ -0,0 +1,146 @@
+"""Per-site snapshots so a restarted script can skip re-mapping and re-fetching."""
+import hashlib
+import json
+import time
+from pathlib import Path
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_DIR = Path(__file__).with_name(".snapshots")
+KEEP_ALIVE = "30m"  # keeps gemma loaded in ollama between queries
+WARM_UP_TIMEOUT = 60
+MAX_PAGES = 40  # newest pages kept per site; expired ones stay as a fetch fallback
+
+
+def _site_path(scope, base_url, kind):
+    # Small files per site and kind, so saving pages never rewrites the map
+    key = hashlib.sha1(base_url.encode("utf-8")).hexdigest()[:16]
+    return SNAPSHOT_DIR / scope / f"{key}.{kind}.json"
+
+
+def _read(path):
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+        return {}
+    return data
+
+
+def _write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write then rename so a crash mid-save never corrupts the old snapshot
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(
+        json.dumps({"version": SNAPSHOT_VERSION, **data}, separators=(",", ":")),
+        encoding="utf-8"
+    )
+    tmp.replace(path)
+
+
+def _recent(timestamp, ttl):
+    return isinstance(timestamp, (int, float)) and time.time() - timestamp < ttl
+
+
+def store_page(pages, url, text):
+    pages[url] = {"text": text, "fetched": time.time()}
+
+
+def is_fresh(pages, url, ttl):
+    page = pages.get(url)
+    return isinstance(page, dict) and _recent(page.get("fetched", 0), ttl)
+
+
+def context_for(pages, urls):
+    return "".join(
+        f"\n--- SOURCE: {u} ---\n{pages[u].get('text', '')}\n" for u in urls if u in pages
+    )
+
+
+def _prune(pages):
+    newest = sorted(pages, key=lambda u: pages[u].get("fetched", 0), reverse=True)
+    for url in newest[MAX_PAGES:]:
+        del pages[url]
+
+
+def restore_site(agent, scope, ttl, remap=False):
+    """Load a fresh saved map into the agent; return False when it must map."""
+    url = agent.base_url
+    site = _read(_site_path(scope, url, "map"))
+    pages = _read(_site_path(scope, url, "pages")).get("pages")
+    last = _read(_site_path(scope, url, "last")).get("sources")
+
+    agent.pages = {
+        u: p for u, p in pages.items() if isinstance(p, dict)
+    } if isinstance(pages, dict) else {}
+    agent.last_sources = []
+    agent.last_targets = []
+    agent.current_context = ""
+
+    links = site.get("links")
+    if remap or not links or not _recent(site.get("mapped", 0), ttl):
+        agent.available_links = []
+        return False
+
+    agent.available_links = links
+    # Only follow up on pages that are still within the TTL
+    if isinstance(last, list):
+        agent.last_sources = [u for u in last if is_fresh(agent.pages, u, ttl)]
+    agent.last_targets = list(agent.last_sources)
+    agent.current_context = context_for(agent.pages, agent.last_sources)
+    print(f"\n♻️ Restored snapshot: {len(links)} pages mapped, {len(agent.pages)} stored.")
+    return True
+
+
+def save_map(agent, scope, success):
+    # A failed or empty map is not worth keeping; the next run retries it
+    if success and agent.available_links:
+        _write(
+            _site_path(scope, agent.base_url, "map"),
+            {"links": agent.available_links, "mapped": time.time()}
+        )
+
+
+async def gather_context(agent, scope, ttl, targets, fetch):
+    """Fill agent.current_context from fresh stored pages, fetching the rest.
+
+    `fetch` is an async callable taking a list of urls and returning
+    {url: text} for the pages it downloaded.
+    """
+    sources = [u for u in targets if is_fresh(agent.pages, u, ttl)]
+    for u in sources:
+        print(f"♻️ Stored: {u}")
+
+    missing = [u for u in targets if u not in sources]
+    fetched = await fetch(missing) if missing else {}
+    for u, text in fetched.items():
+        store_page(agent.pages, u, text)
+        sources.append(u)
+    # A failed re-fetch still beats dropping the expired copy
+    sources += [u for u in missing if u not in fetched and u in agent.pages]
+
+    agent.current_context = context_for(agent.pages, sources)
+    if fetched:
+        _prune(agent.pages)
+        _write(_site_path(scope, agent.base_url, "pages"), {"pages": agent.pages})
+    if sources != agent.last_sources:
+        _write(_site_path(scope, agent.base_url, "last"), {"sources": sources})
+        agent.last_sources = sources
+
+
+def warm_up(model_name):
+    """Load the model into ollama memory before the first real query."""
+    # Imported here so the snapshot helpers stay usable without ollama installed
+    from langchain_ollama import ChatOllama
+
+    print(f"🔥 Warming up {model_name}...")
+    try:
+        ping = ChatOllama(
+            model=model_name,
+            num_predict=1,
+            keep_alive=KEEP_ALIVE,
+            client_kwargs={"timeout": WARM_UP_TIMEOUT}
+        )
+        ping.invoke("hi")
+    except Exception as e:
+        print(f"⚠️ Model warm-up skipped: {e}")
@@ -0,0 +1,100 @@
+import asyncio
+import importlib
+import sys
+from types import ModuleType, SimpleNamespace
+
+import pytest
+
+import snapshot
+
+
+class FakeCrawler:
+    """Stands in for crawl4ai's AsyncWebCrawler; records every url it visits."""
+
+    calls = []
+    failing = set()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    @classmethod
+    def result(cls, url):
+        ok = url not in cls.failing
+        links = [{"url": "/a"}, {"url": "/b"}] if ok else []
+        return SimpleNamespace(
+            url=url, success=ok, markdown=f"text of {url}", links={"internal": links}
+        )
+
+    async def arun(self, url, config=None):
+        self.calls.append(url)
+        return self.result(url)
+
+    async def arun_many(self, urls, config=None):
+        self.calls.extend(urls)
+        return [self.result(u) for u in urls]
+
+
+@pytest.fixture
+def fast(tmp_path, monkeypatch):
+    crawl4ai = ModuleType("crawl4ai")
+    crawl4ai.AsyncWebCrawler = FakeCrawler
+    crawl4ai.CrawlerRunConfig = lambda **kwargs: kwargs
+    crawl4ai.CacheMode = SimpleNamespace(ENABLED="enabled", BYPASS="bypass")
+    langchain_ollama = ModuleType("langchain_ollama")
+    langchain_ollama.ChatOllama = lambda **kwargs: None
+    messages = ModuleType("langchain_core.messages")
+    messages.HumanMessage = lambda content: content
+
+    monkeypatch.setitem(sys.modules, "crawl4ai", crawl4ai)
+    monkeypatch.setitem(sys.modules, "langchain_ollama", langchain_ollama)
+    monkeypatch.setitem(sys.modules, "langchain_core", ModuleType("langchain_core"))
+    monkeypatch.setitem(sys.modules, "langchain_core.messages", messages)
+    monkeypatch.delitem(sys.modules, "fast", raising=False)
+    monkeypatch.setattr(snapshot, "SNAPSHOT_DIR", tmp_path)
+    monkeypatch.setattr(FakeCrawler, "calls", [])
+    monkeypatch.setattr(FakeCrawler, "failing", set())
+
+    yield importlib.import_module("fast")
+    sys.modules.pop("fast", None)
+
+
+def test_failed_map_is_not_saved(fast, tmp_path):
+    FakeCrawler.failing.add("https://x.io/")
+    agent = fast.DetailedSearchAgent()
+    asyncio.run(agent.map_site("https://x.io/"))
+    assert not any(tmp_path.rglob("*.json"))
+
+    FakeCrawler.failing.clear()
+    asyncio.run(fast.DetailedSearchAgent().map_site("https://x.io/"))
+    assert FakeCrawler.calls == ["https://x.io/", "https://x.io/"]
+
+
+def test_restore_skips_mapping_and_fetching(fast):
+    agent = fast.DetailedSearchAgent()
+    asyncio.run(agent.map_site("https://x.io/"))
+    asyncio.run(agent.decide_and_crawl("a"))
+    calls = list(FakeCrawler.calls)
+
+    restarted = fast.DetailedSearchAgent()
+    asyncio.run(restarted.map_site("https://x.io/"))
+    assert restarted.current_context == agent.current_context
+    asyncio.run(restarted.decide_and_crawl("a"))
+    assert FakeCrawler.calls == calls
+    assert restarted.current_context == agent.current_context
+
+    asyncio.run(restarted.map_site("https://x.io/", remap=True))
+    assert FakeCrawler.calls == calls + ["https://x.io/"]
+
+
+def test_switching_site_resets_context(fast):
+    agent = fast.DetailedSearchAgent()
+    asyncio.run(agent.map_site("https://x.io/"))
+    asyncio.run(agent.decide_and_crawl("a"))
+    assert agent.current_context
+
+    asyncio.run(agent.map_site("https://y.io/"))
+    assert agent.last_targets == []
+    assert agent.current_context == ""
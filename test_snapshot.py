@@ -0,0 +1,112 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import snapshot
+
+
+@pytest.fixture(autouse=True)
+def snapshot_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot, "SNAPSHOT_DIR", tmp_path)
+    return tmp_path
+
+
+def make_agent(url="https://x.io/"):
+    return SimpleNamespace(
+        base_url=url, available_links=[], pages={},
+        last_targets=[], last_sources=[], current_context=""
+    )
+
+
+def fetch_returning(result):
+    async def fetch(urls):
+        return {u: t for u, t in result.items() if u in urls}
+    return fetch
+
+
+def test_round_trip():
+    agent = make_agent()
+    agent.available_links = ["https://x.io/a"]
+    snapshot.save_map(agent, "main", success=True)
+    asyncio.run(snapshot.gather_context(
+        agent, "main", 3600, ["https://x.io/a"], fetch_returning({"https://x.io/a": "alpha"})
+    ))
+
+    restored = make_agent()
+    assert snapshot.restore_site(restored, "main", 3600)
+    assert restored.available_links == ["https://x.io/a"]
+    assert restored.last_targets == ["https://x.io/a"]
+    assert restored.current_context == "\n--- SOURCE: https://x.io/a ---\nalpha\n"
+    # Sites and scripts never see each other's snapshots
+    assert not snapshot.restore_site(make_agent("https://y.io/"), "main", 3600)
+    assert not snapshot.restore_site(make_agent(), "fast", 3600)
+
+
+def test_unknown_version_starts_cold():
+    agent = make_agent()
+    agent.available_links = ["https://x.io/a"]
+    snapshot.save_map(agent, "main", success=True)
+    path = snapshot._site_path("main", agent.base_url, "map")
+    path.write_text(path.read_text().replace('"version":1', '"version":2'))
+
+    assert not snapshot.restore_site(make_agent(), "main", 3600)
+
+
+@pytest.mark.parametrize("content", ["[]", "not json", '{"version":1,"links":"x"}'])
+def test_malformed_file_starts_cold(content):
+    path = snapshot._site_path("main", "https://x.io/", "map")
+    path.parent.mkdir(parents=True)
+    path.write_text(content)
+    snapshot._site_path("main", "https://x.io/", "pages").write_text('{"version":1,"pages":[]}')
+
+    agent = make_agent()
+    assert not snapshot.restore_site(agent, "main", 3600)
+    assert agent.pages == {}
+
+
+def test_expired_map_and_context_are_not_restored():
+    agent = make_agent()
+    agent.available_links = ["https://x.io/a"]
+    snapshot.save_map(agent, "main", success=True)
+    asyncio.run(snapshot.gather_context(
+        agent, "main", 3600, ["https://x.io/a"], fetch_returning({"https://x.io/a": "alpha"})
+    ))
+    agent.pages["https://x.io/a"]["fetched"] = time.time() - 7200
+    snapshot._write(snapshot._site_path("main", agent.base_url, "pages"), {"pages": agent.pages})
+
+    # The map is still fresh, but the only source has expired
+    restored = make_agent()
+    assert snapshot.restore_site(restored, "main", 3600)
+    assert restored.current_context == ""
+    # A forced re-map or an expired map always misses
+    assert not snapshot.restore_site(make_agent(), "main", 3600, remap=True)
+    assert not snapshot.restore_site(make_agent(), "main", 1e-9)
+
+
+def test_failed_refetch_falls_back_to_stored_copy():
+    agent = make_agent()
+    agent.pages = {"https://x.io/a": {"text": "old alpha", "fetched": time.time() - 7200}}
+    asyncio.run(snapshot.gather_context(agent, "main", 3600, ["https://x.io/a"], fetch_returning({})))
+    assert agent.current_context == "\n--- SOURCE: https://x.io/a ---\nold alpha\n"
+
+
+def test_pages_are_capped(monkeypatch):
+    monkeypatch.setattr(snapshot, "MAX_PAGES", 2)
+    agent = make_agent()
+    urls = [f"https://x.io/{i}" for i in range(4)]
+    for u in urls:
+        asyncio.run(snapshot.gather_context(agent, "main", 3600, [u], fetch_returning({u: u})))
+    assert sorted(agent.pages) == urls[2:]
+
+
+def test_pages_expire_after_ttl():
+    pages = {
+        "https://x.io/a": {"text": "alpha", "fetched": time.time() - 120},
+        "https://x.io/b": {"text": "beta"},
+    }
+    assert snapshot.is_fresh(pages, "https://x.io/a", ttl=3600)
+    assert not snapshot.is_fresh(pages, "https://x.io/a", ttl=60)
+    assert not snapshot.is_fresh(pages, "https://x.io/b", ttl=3600)
+    assert not snapshot.is_fresh(pages, "https://x.io/c", ttl=3600)